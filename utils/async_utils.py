@@ -0,0 +1,35 @@
+"""Helpers for driving asyncio code from synchronous callers.
+
+The public APIs of this package are synchronous so they can be used from
+scripts and notebooks alike, while network-bound work is implemented with
+asyncio internally.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine, TypeVar
+
+
+T = TypeVar('T')
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion and return its result.
+    
+    Uses ``asyncio.run`` when no event loop is running. Inside a running loop
+    (e.g. a Jupyter notebook), the coroutine is run on a fresh loop in a
+    worker thread instead, since ``asyncio.run`` cannot be nested.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's return value
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
@@ -0,0 +1,48 @@
+"""Helpers for reading and writing the on-disk JSON caches.
+
+Cache entries are stored as gzip-compressed compact JSON (``.json.gz``)
+and written atomically, so an interrupted write never leaves a truncated
+entry behind. Plain ``.json`` entries written by earlier versions are
+still readable.
+"""
+
+import gzip
+import os
+from pathlib import Path
+from typing import Optional
+
+import orjson
+
+
+# Errors raised when reading a corrupt or truncated cache entry
+CACHE_READ_ERRORS = (orjson.JSONDecodeError, OSError, EOFError)
+
+
+def find_cache_file(cache_path: Path) -> Optional[Path]:
+    """Return the existing file for a ``.json.gz`` cache path, if any.
+    
+    Falls back to the legacy uncompressed ``.json`` file next to it.
+    """
+    if cache_path.exists():
+        return cache_path
+    legacy_path = cache_path.with_suffix('')
+    if legacy_path.exists():
+        return legacy_path
+    return None
+
+
+def read_json_bytes(path: Path) -> bytes:
+    """Read the raw JSON of a cache entry, decompressing it if it is gzipped."""
+    if path.suffix == '.gz':
+        with gzip.open(path, 'rb') as f:
+            return f.read()
+    return path.read_bytes()
+
+
+def write_json_bytes(path: Path, payload: bytes) -> None:
+    """Atomically write already serialized JSON as a gzip-compressed cache entry."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with gzip.open(tmp_path, 'wb', compresslevel=1) as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
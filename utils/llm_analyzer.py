@@ -8,89 +8,460 @@ This module provides functionality to:
 """
 
 import os
-import json
+import re
 import logging
-from typing import List, Dict, Optional, Any
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import List, Dict, Optional, Any, Tuple, AsyncIterator
 from pathlib import Path
 import time
+import ijson
 import openai
-from openai import OpenAI
+import orjson
+from openai import OpenAI, AsyncOpenAI
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+from .async_utils import run_sync
+from .rate_limiter import RateLimiter
+from .cache_io import CACHE_READ_ERRORS, find_cache_file, read_json_bytes, write_json_bytes
 
 
 logger = logging.getLogger(__name__)
 
+# System prompts, kept verbatim across calls so the shared prompt prefix
+# can be served from OpenAI's prompt cache
+_COMPREHENSIVE_SYS = "You are an expert in software architecture and research analysis. Provide detailed, technical insights."
+_MIROFISH_SYS = "You are an expert in software architecture validation and framework integration."
+_SUMMARY_SYS = "You are a research synthesis expert."
+
+# Analysis instructions and JSON schemas, shared by the single-paper and
+# batched prompts.
+_COMPREHENSIVE_INSTRUCTIONS = """1. **Key Contributions**: Main contributions and innovations
+2. **Technical Approach**: Methods, algorithms, or techniques used
+3. **Strengths**: What makes this work valuable
+4. **Limitations**: Potential weaknesses or gaps
+5. **Relevance Score** (1-10): How relevant is this to software architecture validation
+6. **Integration Opportunities**: Specific ways this could integrate with MiroFish (a software architecture validation framework)"""
+
+_COMPREHENSIVE_SCHEMA = """{
+  "key_contributions": ["contribution1", "contribution2", ...],
+  "technical_approach": "description",
+  "strengths": ["strength1", "strength2", ...],
+  "limitations": ["limitation1", "limitation2", ...],
+  "relevance_score": <number>,
+  "integration_opportunities": ["opportunity1", "opportunity2", ...],
+  "summary": "brief summary"
+}"""
+
+_MIROFISH_CONTEXT = """MiroFish Context:
+- Validates software architectures against quality attributes
+- Uses AI/ML for pattern recognition and anomaly detection
+- Provides automated architecture analysis and recommendations
+- Supports multiple architecture styles and views"""
+
+_MIROFISH_SCHEMA = """{
+  "validation_techniques": ["technique1", "technique2"],
+  "ai_ml_applications": ["application1", "application2"],
+  "architecture_patterns": ["pattern1", "pattern2"],
+  "quality_attributes": ["attribute1", "attribute2"],
+  "implementation_steps": ["step1", "step2"],
+  "expected_benefits": ["benefit1", "benefit2"],
+  "challenges": ["challenge1", "challenge2"],
+  "priority": "high|medium|low"
+}"""
+
+
+def _template_literal(text: str) -> str:
+    """Escape braces so text can be embedded in a str.format template."""
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+# Single-paper prompt templates, filled with format_map at call time
+_COMPREHENSIVE_PROMPT_TMPL = """Analyze the following academic paper and provide a comprehensive analysis:
+
+Title: {title}
+
+Abstract: {abstract}
+
+Please provide:
+""" + _template_literal(_COMPREHENSIVE_INSTRUCTIONS) + """
+
+Format your response as JSON with the following structure:
+""" + _template_literal(_COMPREHENSIVE_SCHEMA)
+
+_MIROFISH_PROMPT_TMPL = """Given the following academic paper, identify specific integration points with MiroFish, a software architecture validation framework.
+
+""" + _template_literal(_MIROFISH_CONTEXT) + """
+
+Paper:
+Title: {title}
+Abstract: {abstract}
+
+Provide specific integration recommendations in JSON format:
+""" + _template_literal(_MIROFISH_SCHEMA)
+
+# Upper bound on the output budget of a batched call: the smallest
+# completion limit of the supported models
+_BATCH_MAX_TOKENS = 4096
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Whether an API error is worth retrying.
+    
+    Mirrors the OpenAI client's own retry policy, which is disabled in
+    favour of ``_retry_transient``: connection failures and timeouts, and
+    408, 409, 429 and 5xx responses.
+    """
+    if isinstance(exc, openai.APIConnectionError):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code in (408, 409, 429) or exc.status_code >= 500
+    return False
+
+
+# Retry transient API failures with exponential backoff, re-raising the
+# last error once attempts are exhausted
+_retry_transient = retry(
+    wait=wait_random_exponential(multiplier=1, max=30),
+    stop=stop_after_attempt(6),
+    retry=retry_if_exception(_is_transient),
+    reraise=True
+)
+
+# Async client shared by the calls of the running abatch_analyze, with the
+# analyzer that owns it
+_active_aclient: ContextVar[Optional[Tuple[Any, AsyncOpenAI]]] = ContextVar(
+    '_active_aclient', default=None
+)
+
+# Markdown code fence that models sometimes wrap JSON responses in
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*(.*?)\s*```\s*$', re.DOTALL)
+
+
+def _strip_fences(response: str) -> str:
+    """Remove a markdown code fence around a model response, if present."""
+    if (match := _FENCE_RE.match(response)):
+        return match.group(1)
+    return response.strip()
+
 
 class LLMAnalyzer:
     """Analyzes academic papers using OpenAI's language models."""
     
     def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4-turbo-preview",
-                 cache_dir: str = "./cache/llm"):
+                 cache_dir: str = "./cache/llm", max_tokens: int = 1000,
+                 seed: Optional[int] = None, requests_per_minute: float = 60):
         """Initialize the LLM analyzer.
         
         Args:
             api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
             model: OpenAI model to use
             cache_dir: Directory to cache analysis results
+            max_tokens: Default completion token limit per analysis
+            seed: Optional sampling seed, for more reproducible reruns on
+                models that support it
+            requests_per_minute: Maximum rate of API requests
         """
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         if not self.api_key:
             raise ValueError("OpenAI API key must be provided or set in OPENAI_API_KEY env var")
         
-        self.client = OpenAI(api_key=self.api_key)
+        # Retries are handled by _retry_transient rather than the client
+        self.client = OpenAI(api_key=self.api_key, max_retries=0)
         self.model = model
+        self.max_tokens = max_tokens
+        self.seed = seed
+        self.rate_limiter = RateLimiter(requests_per_minute, 60)
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Serialized cache entries, to skip file reads for repeated lookups;
+        # each hit is parsed afresh so callers never share a result object
+        self._mem_cache: Dict[Path, bytes] = {}
+        self._cache_lock = threading.RLock()
+    
+    def _new_aclient(self) -> AsyncOpenAI:
+        """Create an async OpenAI client; the caller must close it."""
+        return AsyncOpenAI(api_key=self.api_key, max_retries=0)
+    
+    @asynccontextmanager
+    async def _aclient(self) -> AsyncIterator[AsyncOpenAI]:
+        """Async OpenAI client for a single call.
+        
+        Inside ``abatch_analyze`` this is the client shared by the whole
+        batch; otherwise a temporary client is created and closed after
+        the call, as its connection pool cannot outlive the event loop.
+        """
+        active = _active_aclient.get()
+        if active is not None and active[0] is self:
+            yield active[1]
+            return
+        
+        async with self._new_aclient() as client:
+            yield client
     
     def _get_cache_path(self, paper_id: str, analysis_type: str) -> Path:
         """Get cache file path for an analysis."""
-        return self.cache_dir / f"{paper_id}_{analysis_type}.json"
+        return self.cache_dir / f"{paper_id}_{analysis_type}.json.gz"
     
     def _load_from_cache(self, paper_id: str, analysis_type: str) -> Optional[Dict]:
         """Load cached analysis if available."""
         cache_path = self._get_cache_path(paper_id, analysis_type)
-        if cache_path.exists():
+        with self._cache_lock:
+            payload = self._mem_cache.get(cache_path)
+        if payload is not None:
+            return orjson.loads(payload)
+        
+        cache_file = find_cache_file(cache_path)
+        if cache_file is not None:
             try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    logger.info(f"Loading cached analysis: {cache_path}")
-                    return json.load(f)
-            except json.JSONDecodeError:
-                logger.warning(f"Invalid cache file: {cache_path}")
+                payload = read_json_bytes(cache_file)
+                data = orjson.loads(payload)
+            except CACHE_READ_ERRORS:
+                logger.warning(f"Invalid cache file: {cache_file}")
+                return None
+            logger.info(f"Loading cached analysis: {cache_file}")
+            with self._cache_lock:
+                self._mem_cache[cache_path] = payload
+            return data
         return None
     
     def _save_to_cache(self, paper_id: str, analysis_type: str, data: Dict) -> None:
         """Save analysis to cache."""
         cache_path = self._get_cache_path(paper_id, analysis_type)
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        payload = orjson.dumps(data)
+        write_json_bytes(cache_path, payload)
+        with self._cache_lock:
+            self._mem_cache[cache_path] = payload
         logger.info(f"Saved analysis to cache: {cache_path}")
     
+    def _completion_params(self, messages: List[Dict[str, str]], temperature: float,
+                           max_tokens: Optional[int]) -> Dict[str, Any]:
+        """Build the chat completion request parameters.
+        
+        Responses are requested in JSON mode, so the model emits bare JSON
+        and stops as soon as the object is complete.
+        """
+        params = {
+            'model': self.model,
+            'messages': messages,
+            'temperature': temperature,
+            'max_tokens': max_tokens or self.max_tokens,
+            'response_format': {'type': 'json_object'}
+        }
+        if self.seed is not None:
+            params['seed'] = self.seed
+        return params
+    
+    @_retry_transient
     def _call_openai(self, messages: List[Dict[str, str]], 
                      temperature: float = 0.3,
-                     max_tokens: int = 2000) -> str:
+                     max_tokens: Optional[int] = None) -> str:
         """Make a call to OpenAI API with error handling."""
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
+            params = self._completion_params(messages, temperature, max_tokens)
+            self.rate_limiter.acquire()
+            response = self.client.chat.completions.create(**params)
             return response.choices[0].message.content
         except Exception as e:
             logger.error(f"OpenAI API error: {e}")
             raise
     
-    def analyze_paper(self, paper: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
+    @_retry_transient
+    async def _acomplete(self, messages: List[Dict[str, str]],
+                         temperature: float = 0.3,
+                         max_tokens: Optional[int] = None) -> Tuple[str, Optional[str]]:
+        """Make an async call to OpenAI API with error handling.
+        
+        Returns:
+            Tuple of the response content and its finish reason
+        """
+        try:
+            async with self._aclient() as client:
+                async with self.rate_limiter:
+                    response = await client.chat.completions.create(
+                        **self._completion_params(messages, temperature, max_tokens)
+                    )
+            choice = response.choices[0]
+            return choice.message.content, choice.finish_reason
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            raise
+    
+    async def _acall_openai(self, messages: List[Dict[str, str]],
+                            temperature: float = 0.3,
+                            max_tokens: Optional[int] = None) -> str:
+        """Make an async call to OpenAI API and return the response content."""
+        content, _ = await self._acomplete(messages, temperature=temperature,
+                                           max_tokens=max_tokens)
+        return content
+    
+    async def _astream_openai_items(self, messages: List[Dict[str, str]],
+                                    temperature: float = 0.3,
+                                    max_tokens: Optional[int] = None,
+                                    prefix: str = 'results.item') -> AsyncIterator[Any]:
+        """Stream a JSON response, yielding the objects under ``prefix``.
+        
+        Each object is yielded as soon as it has been fully received, while
+        the rest of the response is still being generated.
+        """
+        items = ijson.sendable_list()
+        parser = ijson.items_coro(items, prefix, use_float=True)
+        try:
+            async with self._aclient() as client:
+                async with self.rate_limiter:
+                    response = await client.chat.completions.create(
+                        **self._completion_params(messages, temperature, max_tokens), stream=True
+                    )
+                async for chunk in response:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parser.send(chunk.choices[0].delta.content.encode())
+                        for item in items:
+                            yield item
+                        del items[:]
+        except openai.APIError as e:
+            logger.error(f"OpenAI API error: {e}")
+            raise
+        
+        parser.close()
+        for item in items:
+            yield item
+    
+    @staticmethod
+    def _get_paper_id(paper: Dict[str, Any]) -> str:
+        """Get the identifier a paper's analyses are cached under."""
+        return paper.get('paperId', paper.get('id', 'unknown'))
+    
+    @staticmethod
+    def _get_title_abstract(paper: Dict[str, Any]) -> Tuple[str, str]:
+        """Get the title and abstract of a paper for prompting."""
+        title = paper.get('title', 'No title')
+        abstract = paper.get('abstract', paper.get('summary', 'No abstract available'))
+        return title, abstract
+    
+    def _build_comprehensive_messages(self, title: str, abstract: str) -> List[Dict[str, str]]:
+        """Build the chat messages for a comprehensive analysis."""
+        prompt = _COMPREHENSIVE_PROMPT_TMPL.format_map({"title": title, "abstract": abstract})
+        
+        return [
+            {"role": "system", "content": _COMPREHENSIVE_SYS},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _build_mirofish_messages(self, title: str, abstract: str) -> List[Dict[str, str]]:
+        """Build the chat messages for MiroFish integration extraction."""
+        prompt = _MIROFISH_PROMPT_TMPL.format_map({"title": title, "abstract": abstract})
+        
+        return [
+            {"role": "system", "content": _MIROFISH_SYS},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _batch_prompt(self, papers: List[Dict[str, Any]],
+                      analysis_type: str = 'comprehensive') -> List[Dict[str, str]]:
+        """Build the chat messages for analyzing several papers in one call.
+        
+        Each paper is tagged with a 1-based index that the model must echo
+        back, so results can be matched to papers even if some are missing
+        or reordered.
+        """
+        records = []
+        for index, paper in enumerate(papers, 1):
+            title, abstract = self._get_title_abstract(paper)
+            records.append(f"[{index}]\nTitle: {title}\nAbstract: {abstract}")
+        papers_text = "\n\n".join(records)
+        k = len(papers)
+        
+        if analysis_type == 'mirofish':
+            system = _MIROFISH_SYS
+            prompt = f"""For each of the following {k} academic papers, identify specific integration points with MiroFish, a software architecture validation framework.
+
+{_MIROFISH_CONTEXT}
+
+Papers:
+
+{papers_text}"""
+            schema = _MIROFISH_SCHEMA
+        else:
+            system = _COMPREHENSIVE_SYS
+            prompt = f"""Analyze each of the following {k} academic papers and provide a comprehensive analysis of each:
+
+{papers_text}
+
+For each paper, provide:
+{_COMPREHENSIVE_INSTRUCTIONS}"""
+            schema = _COMPREHENSIVE_SCHEMA
+        
+        prompt += f"""
+
+Format your response as a JSON object with a "results" array of exactly {k} objects, one per paper, each with an "index" field holding the paper's number in brackets and otherwise the following structure:
+{schema}"""
+        
+        return [
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt}
+        ]
+    
+    @staticmethod
+    def _loads_response(response: str) -> Any:
+        """Parse a JSON model response."""
+        return orjson.loads(_strip_fences(response))
+    
+    def _loads_batch_items(self, response: str) -> List[Any]:
+        """Parse the result objects of a batched response.
+        
+        If the response was cut off, the results that were completely
+        received are still returned.
+        """
+        try:
+            items = self._loads_response(response)
+        except orjson.JSONDecodeError:
+            items = ijson.sendable_list()
+            parser = ijson.items_coro(items, 'results.item', use_float=True)
+            try:
+                parser.send(_strip_fences(response).encode())
+                parser.close()
+            except ijson.JSONError as e:
+                logger.warning(f"Batched response incomplete, keeping {len(items)} parsed results: {e}")
+            return list(items)
+        
+        if isinstance(items, dict):
+            items = items.get('results')
+        return items if isinstance(items, list) else []
+    
+    def _finalize_result(self, result: Dict[str, Any], paper_id: str, analysis_type: str,
+                         use_cache: bool) -> Dict[str, Any]:
+        """Stamp a parsed result and write it to the cache."""
+        result['paper_id'] = paper_id
+        result['analyzed_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        
+        # Save to cache
+        if use_cache:
+            self._save_to_cache(paper_id, analysis_type, result)
+        
+        return result
+    
+    def _parse_result(self, response: str, paper_id: str, analysis_type: str,
+                      use_cache: bool) -> Dict[str, Any]:
+        """Parse a JSON model response, stamp it and write it to the cache."""
+        return self._finalize_result(self._loads_response(response), paper_id,
+                                     analysis_type, use_cache)
+    
+    def analyze_paper(self, paper: Dict[str, Any], use_cache: bool = True,
+                      max_tokens: Optional[int] = None) -> Dict[str, Any]:
         """Perform comprehensive analysis of a paper.
         
         Args:
             paper: Paper dictionary with title, abstract, and other metadata
             use_cache: Whether to use cached results
+            max_tokens: Completion token limit (defaults to ``self.max_tokens``)
             
         Returns:
             Dictionary containing analysis results
         """
-        paper_id = paper.get('paperId', paper.get('id', 'unknown'))
+        paper_id = self._get_paper_id(paper)
         
         # Check cache
         if use_cache:
@@ -98,65 +469,47 @@ class LLMAnalyzer:
             if cached:
                 return cached
         
-        title = paper.get('title', 'No title')
-        abstract = paper.get('abstract', paper.get('summary', 'No abstract available'))
+        title, abstract = self._get_title_abstract(paper)
+        messages = self._build_comprehensive_messages(title, abstract)
+        response = None
         
-        prompt = f"""Analyze the following academic paper and provide a comprehensive analysis:
-
-Title: {title}
-
-Abstract: {abstract}
-
-Please provide:
-1. **Key Contributions**: Main contributions and innovations
-2. **Technical Approach**: Methods, algorithms, or techniques used
-3. **Strengths**: What makes this work valuable
-4. **Limitations**: Potential weaknesses or gaps
-5. **Relevance Score** (1-10): How relevant is this to software architecture validation
-6. **Integration Opportunities**: Specific ways this could integrate with MiroFish (a software architecture validation framework)
-
-Format your response as JSON with the following structure:
-{{
-  "key_contributions": ["contribution1", "contribution2", ...],
-  "technical_approach": "description",
-  "strengths": ["strength1", "strength2", ...],
-  "limitations": ["limitation1", "limitation2", ...],
-  "relevance_score": <number>,
-  "integration_opportunities": ["opportunity1", "opportunity2", ...],
-  "summary": "brief summary"
-}}"""
+        try:
+            logger.info(f"Analyzing paper: {title}")
+            response = self._call_openai(messages, temperature=0.3, max_tokens=max_tokens)
+            return self._parse_result(response, paper_id, 'comprehensive', use_cache)
+            
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON response: {e}")
+            logger.error(f"Response was: {response}")
+            return {
+                'error': 'Failed to parse analysis',
+                'raw_response': response
+            }
+        except Exception as e:
+            logger.error(f"Analysis failed: {e}")
+            return {'error': str(e)}
+    
+    async def aanalyze_paper(self, paper: Dict[str, Any], use_cache: bool = True,
+                             max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Async variant of :meth:`analyze_paper`."""
+        paper_id = self._get_paper_id(paper)
         
-        messages = [
-            {"role": "system", "content": "You are an expert in software architecture and research analysis. Provide detailed, technical insights."},
-            {"role": "user", "content": prompt}
-        ]
+        # Check cache
+        if use_cache:
+            cached = self._load_from_cache(paper_id, 'comprehensive')
+            if cached:
+                return cached
+        
+        title, abstract = self._get_title_abstract(paper)
+        messages = self._build_comprehensive_messages(title, abstract)
+        response = None
         
         try:
             logger.info(f"Analyzing paper: {title}")
-            response = self._call_openai(messages, temperature=0.3)
-            
-            # Parse JSON response
-            # Remove markdown code blocks if present
-            response = response.strip()
-            if response.startswith('```json'):
-                response = response[7:]
-            if response.startswith('```'):
-                response = response[3:]
-            if response.endswith('```'):
-                response = response[:-3]
-            response = response.strip()
-            
-            analysis = json.loads(response)
-            analysis['paper_id'] = paper_id
-            analysis['analyzed_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Save to cache
-            if use_cache:
-                self._save_to_cache(paper_id, 'comprehensive', analysis)
-            
-            return analysis
+            response = await self._acall_openai(messages, temperature=0.3, max_tokens=max_tokens)
+            return self._parse_result(response, paper_id, 'comprehensive', use_cache)
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON response: {e}")
             logger.error(f"Response was: {response}")
             return {
@@ -168,17 +521,19 @@ Format your response as JSON with the following structure:
             return {'error': str(e)}
     
     def extract_mirofish_integration_points(self, paper: Dict[str, Any], 
-                                           use_cache: bool = True) -> Dict[str, Any]:
+                                           use_cache: bool = True,
+                                           max_tokens: Optional[int] = None) -> Dict[str, Any]:
         """Extract specific MiroFish integration points from a paper.
         
         Args:
             paper: Paper dictionary
             use_cache: Whether to use cached results
+            max_tokens: Completion token limit (defaults to ``self.max_tokens``)
             
         Returns:
             Dictionary with integration recommendations
         """
-        paper_id = paper.get('paperId', paper.get('id', 'unknown'))
+        paper_id = self._get_paper_id(paper)
         
         # Check cache
         if use_cache:
@@ -186,63 +541,47 @@ Format your response as JSON with the following structure:
             if cached:
                 return cached
         
-        title = paper.get('title', 'No title')
-        abstract = paper.get('abstract', paper.get('summary', 'No abstract available'))
+        title, abstract = self._get_title_abstract(paper)
+        messages = self._build_mirofish_messages(title, abstract)
+        response = None
         
-        prompt = f"""Given the following academic paper, identify specific integration points with MiroFish, a software architecture validation framework.
-
-MiroFish Context:
-- Validates software architectures against quality attributes
-- Uses AI/ML for pattern recognition and anomaly detection
-- Provides automated architecture analysis and recommendations
-- Supports multiple architecture styles and views
-
-Paper:
-Title: {title}
-Abstract: {abstract}
-
-Provide specific integration recommendations in JSON format:
-{{
-  "validation_techniques": ["technique1", "technique2"],
-  "ai_ml_applications": ["application1", "application2"],
-  "architecture_patterns": ["pattern1", "pattern2"],
-  "quality_attributes": ["attribute1", "attribute2"],
-  "implementation_steps": ["step1", "step2"],
-  "expected_benefits": ["benefit1", "benefit2"],
-  "challenges": ["challenge1", "challenge2"],
-  "priority": "high|medium|low"
-}}"""
+        try:
+            logger.info(f"Extracting MiroFish integration points: {title}")
+            response = self._call_openai(messages, temperature=0.2, max_tokens=max_tokens)
+            return self._parse_result(response, paper_id, 'mirofish', use_cache)
+            
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON response: {e}")
+            return {
+                'error': 'Failed to parse integration points',
+                'raw_response': response
+            }
+        except Exception as e:
+            logger.error(f"Integration analysis failed: {e}")
+            return {'error': str(e)}
+    
+    async def aextract_mirofish_integration_points(self, paper: Dict[str, Any],
+                                                   use_cache: bool = True,
+                                                   max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Async variant of :meth:`extract_mirofish_integration_points`."""
+        paper_id = self._get_paper_id(paper)
         
-        messages = [
-            {"role": "system", "content": "You are an expert in software architecture validation and framework integration."},
-            {"role": "user", "content": prompt}
-        ]
+        # Check cache
+        if use_cache:
+            cached = self._load_from_cache(paper_id, 'mirofish')
+            if cached:
+                return cached
+        
+        title, abstract = self._get_title_abstract(paper)
+        messages = self._build_mirofish_messages(title, abstract)
+        response = None
         
         try:
             logger.info(f"Extracting MiroFish integration points: {title}")
-            response = self._call_openai(messages, temperature=0.2)
-            
-            # Parse JSON response
-            response = response.strip()
-            if response.startswith('```json'):
-                response = response[7:]
-            if response.startswith('```'):
-                response = response[3:]
-            if response.endswith('```'):
-                response = response[:-3]
-            response = response.strip()
+            response = await self._acall_openai(messages, temperature=0.2, max_tokens=max_tokens)
+            return self._parse_result(response, paper_id, 'mirofish', use_cache)
             
-            integration = json.loads(response)
-            integration['paper_id'] = paper_id
-            integration['analyzed_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Save to cache
-            if use_cache:
-                self._save_to_cache(paper_id, 'mirofish', integration)
-            
-            return integration
-            
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON response: {e}")
             return {
                 'error': 'Failed to parse integration points',
@@ -252,43 +591,227 @@ Provide specific integration recommendations in JSON format:
             logger.error(f"Integration analysis failed: {e}")
             return {'error': str(e)}
     
+    async def _aanalyze_one(self, paper: Dict[str, Any], analysis_type: str) -> Dict[str, Any]:
+        """Analyze a single paper with the given analysis type."""
+        if analysis_type == 'mirofish':
+            return await self.aextract_mirofish_integration_points(paper)
+        return await self.aanalyze_paper(paper)
+    
+    async def _aanalyze_chunk(self, papers: List[Dict[str, Any]],
+                              analysis_type: str,
+                              stream: bool = False) -> List[Dict[str, Any]]:
+        """Analyze several papers with a single API call.
+        
+        With ``stream``, each result is parsed and cached as soon as it
+        is complete in the streamed response. Papers whose result is
+        missing from the response (or when the response cannot be parsed)
+        are retried with individual calls.
+        """
+        if len(papers) == 1:
+            return [await self._aanalyze_one(papers[0], analysis_type)]
+        
+        messages = self._batch_prompt(papers, analysis_type)
+        temperature = 0.2 if analysis_type == 'mirofish' else 0.3
+        # Give each paper the single-analysis budget, up to the model limit
+        max_tokens = min(len(papers) * self.max_tokens, _BATCH_MAX_TOKENS)
+        by_index: Dict[int, Dict[str, Any]] = {}
+        
+        def collect(item: Any) -> None:
+            if not isinstance(item, dict):
+                return
+            try:
+                index = int(item.pop('index'))
+            except (KeyError, TypeError, ValueError):
+                return
+            if 1 <= index <= len(papers) and index not in by_index:
+                by_index[index] = self._finalize_result(
+                    item, self._get_paper_id(papers[index - 1]), analysis_type, use_cache=True)
+        
+        try:
+            if stream:
+                async for item in self._astream_openai_items(messages, temperature=temperature,
+                                                             max_tokens=max_tokens):
+                    collect(item)
+            else:
+                response, finish_reason = await self._acomplete(messages, temperature=temperature,
+                                                                max_tokens=max_tokens)
+                if finish_reason == 'length':
+                    logger.warning(f"Batched response hit the {max_tokens}-token limit; "
+                                   f"papers without a result are retried individually")
+                for item in self._loads_batch_items(response):
+                    collect(item)
+        except (orjson.JSONDecodeError, ijson.JSONError) as e:
+            logger.warning(f"Failed to parse batched response, falling back to single calls: {e}")
+        except openai.APIError as e:
+            # Keep the results already received; the rest go through the
+            # retried single-paper path
+            logger.warning(f"Batched request failed after {len(by_index)} results, "
+                           f"falling back to single calls: {e}")
+        
+        results = []
+        for index, paper in enumerate(papers, 1):
+            result = by_index.get(index)
+            if result is None:
+                result = await self._aanalyze_one(paper, analysis_type)
+            results.append(result)
+        return results
+    
+    @staticmethod
+    def _load_checkpoint(checkpoint_path: Path, analysis_type: str) -> Dict[str, Dict[str, Any]]:
+        """Load results recorded in a JSONL checkpoint file, keyed by paper ID.
+        
+        Only lines recorded for ``analysis_type`` are loaded.
+        """
+        completed = {}
+        if not checkpoint_path.exists():
+            return completed
+        
+        with open(checkpoint_path, 'rb') as f:
+            for line in f:
+                try:
+                    result = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    # Partial line from an interrupted write
+                    logger.warning(f"Skipping invalid checkpoint line in {checkpoint_path}")
+                    continue
+                if not isinstance(result, dict) or not result.get('paper_id'):
+                    continue
+                if result.pop('analysis_type', None) == analysis_type:
+                    completed[result['paper_id']] = result
+        
+        logger.info(f"Loaded {len(completed)} checkpointed results from {checkpoint_path}")
+        return completed
+    
     def batch_analyze(self, papers: List[Dict[str, Any]], 
                      analysis_type: str = 'comprehensive',
-                     delay: float = 1.0) -> List[Dict[str, Any]]:
+                     delay: Optional[float] = None,
+                     max_concurrency: int = 5,
+                     batch_size: int = 5,
+                     checkpoint_path: Optional[Path] = None,
+                     stream: bool = False) -> List[Dict[str, Any]]:
         """Analyze multiple papers in batch.
         
+        Synchronous wrapper around :meth:`abatch_analyze`.
+        
         Args:
             papers: List of paper dictionaries
             analysis_type: Type of analysis ('comprehensive' or 'mirofish')
-            delay: Delay between API calls to respect rate limits
+            delay: Deprecated and ignored; the request rate is set by
+                ``requests_per_minute``
+            max_concurrency: Maximum number of in-flight API calls
+            batch_size: Number of papers packed into each API call
+            checkpoint_path: Optional JSONL file recording completed results
+            stream: Stream batched responses, caching each paper's result
+                as soon as it has been received
             
         Returns:
-            List of analysis results
+            List of analysis results, in the same order as ``papers``
         """
-        results = []
-        total = len(papers)
+        return run_sync(self.abatch_analyze(papers, analysis_type=analysis_type,
+                                            delay=delay, max_concurrency=max_concurrency,
+                                            batch_size=batch_size,
+                                            checkpoint_path=checkpoint_path,
+                                            stream=stream))
+    
+    async def abatch_analyze(self, papers: List[Dict[str, Any]],
+                             analysis_type: str = 'comprehensive',
+                             delay: Optional[float] = None,
+                             max_concurrency: int = 5,
+                             batch_size: int = 5,
+                             checkpoint_path: Optional[Path] = None,
+                             stream: bool = False) -> List[Dict[str, Any]]:
+        """Analyze multiple papers concurrently.
         
-        for i, paper in enumerate(papers, 1):
-            logger.info(f"Analyzing paper {i}/{total}")
+        Cached analyses are returned as-is; the remaining papers are packed
+        ``batch_size`` at a time into a single prompt, and the chunks are
+        sent concurrently. Results are still cached per paper.
+        
+        With a ``checkpoint_path``, each successful result is appended to
+        that JSONL file as soon as its chunk completes, tagged with the
+        ``analysis_type``. Papers already recorded there for the same type
+        are skipped, so an interrupted batch can be resumed.
+        
+        Args:
+            papers: List of paper dictionaries
+            analysis_type: Type of analysis ('comprehensive' or 'mirofish')
+            delay: Deprecated and ignored; the request rate is set by
+                ``requests_per_minute``
+            max_concurrency: Maximum number of in-flight API calls, to stay
+                under the account's RPM/TPM limits
+            batch_size: Number of papers packed into each API call; keep
+                it small enough for the responses to fit in ``max_tokens``
+            checkpoint_path: Optional JSONL file recording completed results
+            stream: Stream batched responses, caching each paper's result
+                as soon as it has been received
             
-            try:
-                if analysis_type == 'mirofish':
-                    result = self.extract_mirofish_integration_points(paper)
-                else:
-                    result = self.analyze_paper(paper)
-                
-                results.append(result)
+        Returns:
+            List of analysis results, in the same order as ``papers``
+        """
+        if analysis_type != 'mirofish':
+            analysis_type = 'comprehensive'
+        
+        total = len(papers)
+        results: List[Optional[Dict[str, Any]]] = [None] * total
+        
+        completed = {}
+        if checkpoint_path is not None:
+            checkpoint_path = Path(checkpoint_path)
+            completed = self._load_checkpoint(checkpoint_path, analysis_type)
+        
+        # Serve checkpointed results and cache hits directly, only misses
+        # go to the API
+        pending = []
+        for i, paper in enumerate(papers):
+            paper_id = self._get_paper_id(paper)
+            cached = completed.get(paper_id) or self._load_from_cache(paper_id, analysis_type)
+            if cached:
+                results[i] = cached
+            else:
+                pending.append(i)
+        
+        batch_size = max(1, batch_size)
+        chunks = [pending[j:j + batch_size] for j in range(0, len(pending), batch_size)]
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def analyze(chunk: List[int]) -> Tuple[List[int], List[Dict[str, Any]]]:
+            async with semaphore:
+                logger.info(f"Analyzing papers {chunk[0] + 1}-{chunk[-1] + 1}/{total}")
+                try:
+                    chunk_results = await self._aanalyze_chunk([papers[i] for i in chunk],
+                                                               analysis_type, stream=stream)
+                except Exception as e:
+                    logger.error(f"Failed to analyze papers {chunk[0] + 1}-{chunk[-1] + 1}: {e}")
+                    chunk_results = [{
+                        'paper_id': self._get_paper_id(papers[i]),
+                        'error': str(e)
+                    } for i in chunk]
                 
-                # Rate limiting
-                if i < total:
-                    time.sleep(delay)
-                    
-            except Exception as e:
-                logger.error(f"Failed to analyze paper {i}: {e}")
-                results.append({
-                    'paper_id': paper.get('paperId', paper.get('id', 'unknown')),
-                    'error': str(e)
-                })
+                return chunk, chunk_results
+        
+        checkpoint = None
+        if checkpoint_path is not None:
+            checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+            checkpoint = open(checkpoint_path, 'ab')
+        
+        # One client for the whole batch, closed once every chunk is done;
+        # the chunk tasks inherit it through the context
+        client = self._new_aclient()
+        client_token = _active_aclient.set((self, client))
+        try:
+            for next_done in asyncio.as_completed([analyze(chunk) for chunk in chunks]):
+                chunk, chunk_results = await next_done
+                for i, result in zip(chunk, chunk_results):
+                    results[i] = result
+                    if checkpoint is not None and 'error' not in result:
+                        line = dict(result, analysis_type=analysis_type)
+                        checkpoint.write(orjson.dumps(line) + b"\n")
+                if checkpoint is not None:
+                    checkpoint.flush()
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+            _active_aclient.reset(client_token)
+            await client.close()
         
         return results
     
@@ -303,7 +826,7 @@ Provide specific integration recommendations in JSON format:
         """
         prompt = f"""Summarize the following research paper analyses into a cohesive overview:
 
-{json.dumps(analyses, indent=2)}
+{orjson.dumps(analyses).decode()}
 
 Provide:
 1. **Overall Themes**: Common themes across papers
@@ -324,7 +847,7 @@ Format as JSON:
 }}"""
         
         messages = [
-            {"role": "system", "content": "You are a research synthesis expert."},
+            {"role": "system", "content": _SUMMARY_SYS},
             {"role": "user", "content": prompt}
         ]
         
@@ -332,16 +855,7 @@ Format as JSON:
             response = self._call_openai(messages, temperature=0.4, max_tokens=3000)
             
             # Parse JSON response
-            response = response.strip()
-            if response.startswith('```json'):
-                response = response[7:]
-            if response.startswith('```'):
-                response = response[3:]
-            if response.endswith('```'):
-                response = response[:-3]
-            response = response.strip()
-            
-            summary = json.loads(response)
+            summary = self._loads_response(response)
             return summary
             
         except Exception as e:
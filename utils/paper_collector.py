@@ -7,41 +7,72 @@ This module provides functionality to:
 - Track progress for long-running collection tasks
 """
 
-import time
-import json
 import logging
-from typing import List, Dict, Optional, Any
+import asyncio
+import functools
+import threading
+from collections import deque
+from typing import List, Dict, Optional, Any, Tuple
 from pathlib import Path
 from datetime import datetime, timedelta
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import hashlib
+import httpx
+import orjson
+from lxml import etree
+
+from .async_utils import run_sync
+from .rate_limiter import RateLimiter
+from .cache_io import CACHE_READ_ERRORS, find_cache_file, read_json_bytes, write_json_bytes
 
 
 logger = logging.getLogger(__name__)
 
+ATOM_NAMESPACE = 'http://www.w3.org/2005/Atom'
+
+# Fully-qualified tags for hot lookups, skipping the prefix map resolution
+_ATOM_ENTRY = f'{{{ATOM_NAMESPACE}}}entry'
+_ATOM_ID = f'{{{ATOM_NAMESPACE}}}id'
+_ATOM_TITLE = f'{{{ATOM_NAMESPACE}}}title'
+_ATOM_SUMMARY = f'{{{ATOM_NAMESPACE}}}summary'
+_ATOM_PUBLISHED = f'{{{ATOM_NAMESPACE}}}published'
+_ATOM_UPDATED = f'{{{ATOM_NAMESPACE}}}updated'
+_ATOM_AUTHOR = f'{{{ATOM_NAMESPACE}}}author'
+_ATOM_NAME = f'{{{ATOM_NAMESPACE}}}name'
+
 
 class PaperCollector:
     """Collects academic papers from multiple sources with caching and retry logic."""
     
     SEMANTIC_SCHOLAR_API = "https://api.semanticscholar.org/graph/v1"
     ARXIV_API = "http://export.arxiv.org/api/query"
+    SEMANTIC_SCHOLAR_PAGE_SIZE = 100
+    SEMANTIC_SCHOLAR_BATCH_SIZE = 500
     
-    def __init__(self, cache_dir: str = "./cache", api_key: Optional[str] = None):
+    def __init__(self, cache_dir: str = "./cache", api_key: Optional[str] = None,
+                 requests_per_second: float = 1.0):
         """Initialize the paper collector.
         
         Args:
             cache_dir: Directory to store cached API responses
             api_key: Optional Semantic Scholar API key for higher rate limits
+            requests_per_second: Maximum rate of API requests
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.api_key = api_key
         self.session = self._create_session()
+        self.rate_limiter = RateLimiter(requests_per_second)
+        
+        # Serialized cache entries with their save time, to skip file reads;
+        # each hit is parsed afresh so callers never share a result object
+        self._mem_cache: Dict[Path, Tuple[float, bytes]] = {}
+        self._cache_lock = threading.RLock()
         
     def _create_session(self) -> requests.Session:
-        """Create a requests session with retry logic."""
+        """Create a shared keep-alive requests session with retry logic."""
         session = requests.Session()
         retry_strategy = Retry(
             total=5,
@@ -54,43 +85,88 @@ class PaperCollector:
         session.mount("https://", adapter)
         return session
     
-    def _get_cache_key(self, query: str, source: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _get_cache_key(query: str, source: str) -> str:
         """Generate a cache key for a query."""
         key_string = f"{source}:{query}"
-        return hashlib.md5(key_string.encode()).hexdigest()
+        return hashlib.blake2b(key_string.encode(), digest_size=8).hexdigest()
+    
+    def _get_cache_path(self, cache_key: str) -> Path:
+        """Get cache file path for a cache key.
+        
+        Files are sharded into subdirectories by the first two hex digits
+        of the key, keeping directories small as the cache grows.
+        """
+        return self.cache_dir / cache_key[:2] / f"{cache_key}.json.gz"
     
     def _load_from_cache(self, cache_key: str, max_age_hours: int = 24) -> Optional[Dict]:
         """Load cached data if it exists and is not expired."""
-        cache_file = self.cache_dir / f"{cache_key}.json"
+        cache_path = self._get_cache_path(cache_key)
         
-        if not cache_file.exists():
-            return None
+        with self._cache_lock:
+            entry = self._mem_cache.get(cache_path)
+        
+        if entry is not None:
+            saved_at, payload = entry
+        else:
+            cache_file = find_cache_file(cache_path)
+            if cache_file is None:
+                return None
+            saved_at, payload = cache_file.stat().st_mtime, None
         
         # Check cache age
-        file_time = datetime.fromtimestamp(cache_file.stat().st_mtime)
-        if datetime.now() - file_time > timedelta(hours=max_age_hours):
+        if datetime.now() - datetime.fromtimestamp(saved_at) > timedelta(hours=max_age_hours):
             logger.info(f"Cache expired for key {cache_key}")
             return None
         
-        try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                logger.info(f"Loading from cache: {cache_key}")
-                return json.load(f)
-        except json.JSONDecodeError:
-            logger.warning(f"Invalid cache file: {cache_file}")
-            return None
+        if payload is None:
+            try:
+                payload = read_json_bytes(cache_file)
+                data = orjson.loads(payload)
+            except CACHE_READ_ERRORS:
+                logger.warning(f"Invalid cache file: {cache_file}")
+                return None
+            with self._cache_lock:
+                self._mem_cache[cache_path] = (saved_at, payload)
+        else:
+            data = orjson.loads(payload)
+        
+        logger.info(f"Loading from cache: {cache_key}")
+        return data
     
     def _save_to_cache(self, cache_key: str, data: Dict) -> None:
         """Save data to cache."""
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        cache_path = self._get_cache_path(cache_key)
+        payload = orjson.dumps(data)
+        write_json_bytes(cache_path, payload)
+        with self._cache_lock:
+            self._mem_cache[cache_path] = (datetime.now().timestamp(), payload)
         logger.info(f"Saved to cache: {cache_key}")
     
     def search_semantic_scholar(self, query: str, limit: int = 100, 
                                 fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Search Semantic Scholar for papers.
         
+        Synchronous wrapper around :meth:`asearch_semantic_scholar`.
+        
+        Args:
+            query: Search query string
+            limit: Maximum number of results to return
+            fields: List of fields to include in response
+            
+        Returns:
+            List of paper dictionaries
+        """
+        return run_sync(self.asearch_semantic_scholar(query, limit=limit, fields=fields))
+    
+    async def asearch_semantic_scholar(self, query: str, limit: int = 100,
+                                       fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Search Semantic Scholar for papers, fetching result pages concurrently.
+        
+        The first page is fetched alone to learn the total number of hits;
+        the remaining offsets are then requested concurrently.
+        
         Args:
             query: Search query string
             limit: Maximum number of results to return
@@ -113,44 +189,50 @@ class PaperCollector:
         if cached_data is not None:
             return cached_data
         
-        # Make API request
+        # Make API requests
         url = f"{self.SEMANTIC_SCHOLAR_API}/paper/search"
         headers = {}
         if self.api_key:
             headers['x-api-key'] = self.api_key
         
-        all_papers = []
-        offset = 0
+        # Rate limiting - be respectful
+        semaphore = asyncio.Semaphore(5)
         
-        with requests.Session() as session:
-            while len(all_papers) < limit:
+        async with httpx.AsyncClient(http2=True, headers=headers, timeout=30) as client:
+            
+            async def fetch_page(offset: int) -> Optional[Dict[str, Any]]:
                 params = {
                     'query': query,
-                    'limit': min(100, limit - len(all_papers)),
+                    'limit': min(self.SEMANTIC_SCHOLAR_PAGE_SIZE, limit - offset),
                     'offset': offset,
                     'fields': ','.join(fields)
                 }
+                async with semaphore, self.rate_limiter:
+                    try:
+                        logger.info(f"Querying Semantic Scholar (offset={offset})...")
+                        response = await client.get(url, params=params)
+                        response.raise_for_status()
+                        return response.json()
+                    except (httpx.HTTPError, ValueError) as e:
+                        logger.error(f"Error querying Semantic Scholar: {e}")
+                        return None
+            
+            first_page = await fetch_page(0)
+            all_papers = first_page.get('data', []) if first_page else []
+            
+            if all_papers:
+                total = min(limit, first_page.get('total', 0))
+                offsets = range(len(all_papers), total, self.SEMANTIC_SCHOLAR_PAGE_SIZE)
+                pages = await asyncio.gather(*(fetch_page(offset) for offset in offsets))
                 
-                try:
-                    logger.info(f"Querying Semantic Scholar (offset={offset})...")
-                    response = session.get(url, params=params, headers=headers, timeout=30)
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    papers = data.get('data', [])
-                    
-                    if not papers:
+                # Keep the contiguous prefix of results, as a failed page
+                # would otherwise leave a gap
+                for page in pages:
+                    if not page or not page.get('data'):
                         break
-                    
-                    all_papers.extend(papers)
-                    offset += len(papers)
-                    
-                    # Rate limiting - be respectful
-                    time.sleep(1)
-                    
-                except requests.exceptions.RequestException as e:
-                    logger.error(f"Error querying Semantic Scholar: {e}")
-                    break
+                    all_papers.extend(page['data'])
+        
+        all_papers = all_papers[:limit]
         
         # Save to cache
         self._save_to_cache(cache_key, all_papers)
@@ -186,29 +268,41 @@ class PaperCollector:
         
         try:
             logger.info(f"Querying arXiv for: {query}")
-            response = self.session.get(self.ARXIV_API, params=params, timeout=30)
-            response.raise_for_status()
-            
-            # Parse XML response
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(response.content)
-            
-            # Namespace handling
-            ns = {'atom': 'http://www.w3.org/2005/Atom'}
-            
-            papers = []
-            for entry in root.findall('atom:entry', ns):
-                paper = {
-                    'id': entry.find('atom:id', ns).text,
-                    'title': entry.find('atom:title', ns).text.strip(),
-                    'summary': entry.find('atom:summary', ns).text.strip(),
-                    'published': entry.find('atom:published', ns).text,
-                    'updated': entry.find('atom:updated', ns).text,
-                    'authors': [author.find('atom:name', ns).text 
-                               for author in entry.findall('atom:author', ns)],
-                    'url': entry.find('atom:id', ns).text
-                }
-                papers.append(paper)
+            self.rate_limiter.acquire()
+            with self.session.get(self.ARXIV_API, params=params, timeout=30,
+                                  stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                
+                # Parse entries as they stream in instead of building the
+                # whole document tree first
+                papers = []
+                for _, entry in etree.iterparse(response.raw, events=('end',),
+                                                tag=_ATOM_ENTRY):
+                    # Resolve each child once; the id doubles as the URL
+                    entry_id = entry.find(_ATOM_ID).text
+                    title = entry.find(_ATOM_TITLE).text.strip()
+                    summary = entry.find(_ATOM_SUMMARY).text.strip()
+                    published = entry.find(_ATOM_PUBLISHED).text
+                    updated = entry.find(_ATOM_UPDATED).text
+                    authors = [author.find(_ATOM_NAME).text 
+                               for author in entry.iterfind(_ATOM_AUTHOR)]
+                    
+                    paper = {
+                        'id': entry_id,
+                        'title': title,
+                        'summary': summary,
+                        'published': published,
+                        'updated': updated,
+                        'authors': authors,
+                        'url': entry_id
+                    }
+                    papers.append(paper)
+                    
+                    # Drop processed entries to keep memory flat
+                    entry.clear()
+                    while entry.getprevious() is not None:
+                        del entry.getparent()[0]
             
             # Save to cache
             self._save_to_cache(cache_key, papers)
@@ -244,7 +338,8 @@ class PaperCollector:
                 headers['x-api-key'] = self.api_key
             
             try:
-                response = self.session.get(url, headers=headers, timeout=30)
+                with self.rate_limiter:
+                    response = self.session.get(url, headers=headers, timeout=30)
                 response.raise_for_status()
                 paper = response.json()
                 
@@ -258,13 +353,79 @@ class PaperCollector:
         
         return None
     
+    def get_paper_details_batch(self, paper_ids: List[str],
+                                fields: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Get details for many Semantic Scholar papers via the batch endpoint.
+        
+        Cached papers are served from the cache; the rest are requested in
+        chunks of up to ``SEMANTIC_SCHOLAR_BATCH_SIZE`` IDs per call.
+        
+        Args:
+            paper_ids: Paper identifiers
+            fields: List of fields to include in response
+            
+        Returns:
+            Dictionary mapping paper IDs to details; papers that were not
+            found or failed to fetch are omitted
+        """
+        if fields is None:
+            fields = [
+                'paperId', 'title', 'abstract', 'year', 'authors',
+                'citationCount', 'venue', 'url', 'citations.paperId'
+            ]
+        fields_param = ','.join(fields)
+        
+        papers = {}
+        missing = []
+        for paper_id in dict.fromkeys(paper_ids):
+            cached_data = self._load_from_cache(
+                self._get_cache_key(f"details:{paper_id}:{fields_param}", "semantic_scholar"))
+            if cached_data is not None:
+                papers[paper_id] = cached_data
+            else:
+                missing.append(paper_id)
+        
+        url = f"{self.SEMANTIC_SCHOLAR_API}/paper/batch"
+        headers = {}
+        if self.api_key:
+            headers['x-api-key'] = self.api_key
+        
+        for start in range(0, len(missing), self.SEMANTIC_SCHOLAR_BATCH_SIZE):
+            chunk = missing[start:start + self.SEMANTIC_SCHOLAR_BATCH_SIZE]
+            try:
+                logger.info(f"Fetching details for {len(chunk)} papers from Semantic Scholar...")
+                with self.rate_limiter:
+                    response = self.session.post(url, params={'fields': fields_param},
+                                                 json={'ids': chunk}, headers=headers, timeout=60)
+                response.raise_for_status()
+                results = response.json()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.error(f"Error fetching paper details: {e}")
+                continue
+            
+            # Results are aligned with the requested IDs, null if not found
+            for paper_id, paper in zip(chunk, results):
+                if paper:
+                    papers[paper_id] = paper
+                    self._save_to_cache(
+                        self._get_cache_key(f"details:{paper_id}:{fields_param}", "semantic_scholar"),
+                        paper)
+        
+        return papers
+    
     def collect_citation_network(self, seed_paper_ids: List[str], 
-                                 depth: int = 2) -> Dict[str, Any]:
+                                 depth: int = 2,
+                                 fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """Collect citation network starting from seed papers.
         
+        The network is traversed breadth-first, one citation level at a
+        time; the papers of each level are fetched with batch requests.
+        
         Args:
             seed_paper_ids: List of paper IDs to start from
             depth: How many citation levels to traverse
+            fields: Paper fields to fetch (must include citations for the
+                traversal to go past the seed papers)
             
         Returns:
             Dictionary containing papers and citation relationships
@@ -272,33 +433,41 @@ class PaperCollector:
         papers = {}
         citations = []
         visited = set()
-        to_visit = [(pid, 0) for pid in seed_paper_ids]
+        # Papers are queued at most once; in BFS order the first time a
+        # paper is reached is also at its shallowest depth
+        enqueued = set(seed_paper_ids)
+        to_visit = deque((pid, 0) for pid in dict.fromkeys(seed_paper_ids))
         
         while to_visit:
-            paper_id, current_depth = to_visit.pop(0)
-            
-            if paper_id in visited or current_depth >= depth:
-                continue
+            # Drain the current level of the traversal
+            current_depth = to_visit[0][1]
+            frontier = []
+            while to_visit and to_visit[0][1] == current_depth:
+                paper_id, _ = to_visit.popleft()
+                if paper_id in visited or current_depth >= depth:
+                    continue
+                visited.add(paper_id)
+                frontier.append(paper_id)
             
-            visited.add(paper_id)
-            
-            # Get paper details
-            paper = self.get_paper_details(paper_id)
-            if not paper:
-                continue
+            # Get paper details for the whole level
+            details = self.get_paper_details_batch(frontier, fields=fields) if frontier else {}
             
-            papers[paper_id] = paper
-            
-            # Add citations
-            if 'citations' in paper and current_depth < depth - 1:
-                for cited_paper in paper.get('citations', [])[:10]:  # Limit to avoid explosion
-                    cited_id = cited_paper.get('paperId')
-                    if cited_id:
-                        citations.append({'from': paper_id, 'to': cited_id})
-                        to_visit.append((cited_id, current_depth + 1))
-            
-            # Rate limiting
-            time.sleep(1)
+            for paper_id in frontier:
+                paper = details.get(paper_id)
+                if not paper:
+                    continue
+                
+                papers[paper_id] = paper
+                
+                # Add citations
+                if 'citations' in paper and current_depth < depth - 1:
+                    for cited_paper in (paper.get('citations') or [])[:10]:  # Limit to avoid explosion
+                        cited_id = cited_paper.get('paperId')
+                        if cited_id:
+                            citations.append({'from': paper_id, 'to': cited_id})
+                            if cited_id not in enqueued:
+                                enqueued.add(cited_id)
+                                to_visit.append((cited_id, current_depth + 1))
             
             logger.info(f"Progress: {len(visited)} papers collected")
         
@@ -0,0 +1,74 @@
+"""Token-bucket rate limiting shared by synchronous and async callers."""
+
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """Token-bucket rate limiter usable from threads and coroutines.
+    
+    Allows bursts of up to ``max_rate`` requests and refills at
+    ``max_rate`` per ``time_period`` seconds. Callers only wait when the
+    budget is actually exhausted, unlike a fixed sleep after each request.
+    
+    Use ``with limiter:`` in synchronous code and ``async with limiter:``
+    in coroutines; both draw from the same budget.
+    """
+    
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        """Initialize the rate limiter.
+        
+        Args:
+            max_rate: Number of requests allowed per time period
+            time_period: Length of the time period in seconds
+        """
+        if max_rate <= 0 or time_period <= 0:
+            raise ValueError("max_rate and time_period must be positive")
+        
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = float(max_rate)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Take a token and return how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            refill = (now - self._updated_at) * self.max_rate / self.time_period
+            self._tokens = min(self.max_rate, self._tokens + refill)
+            self._updated_at = now
+            
+            # Tokens may go negative: each caller reserves its own slot, so
+            # waiters are served in order
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens * self.time_period / self.max_rate
+    
+    def acquire(self) -> None:
+        """Block until a request may be made."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def aacquire(self) -> None:
+        """Wait asynchronously until a request may be made."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    def __enter__(self) -> 'RateLimiter':
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        return None
+    
+    async def __aenter__(self) -> 'RateLimiter':
+        await self.aacquire()
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        return None
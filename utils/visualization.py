@@ -8,48 +8,257 @@ This module provides functionality to:
 """
 
 import logging
+import os
+import functools
+import hashlib
 from typing import List, Dict, Optional, Any, Tuple
 from pathlib import Path
 import json
 from datetime import datetime
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
 import networkx as nx
 import numpy as np
-from collections import Counter, defaultdict
+from collections import defaultdict
 
-try:
-    import plotly.graph_objects as go
-    import plotly.express as px
-    from plotly.subplots import make_subplots
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
-    logging.warning("Plotly not available. Interactive visualizations will be disabled.")
+logger = logging.getLogger(__name__)
 
+# From this many nodes, layouts use the sparse energy-based solver
+SPARSE_LAYOUT_THRESHOLD = 500
+
+# Above this many nodes, static citation networks are rasterized with datashader
+DATASHADER_NODE_THRESHOLD = 10_000
+
+
+def _fast_spring_layout(G: nx.Graph, k: float = 2, iterations: int = 50,
+                        seed: int = 42) -> Dict[Any, np.ndarray]:
+    """Compute a spring layout, using the sparse solver for large graphs.
+    
+    Large graphs are laid out by minimizing the Fruchterman-Reingold energy
+    on the sparse adjacency with L-BFGS instead of running the dense O(N^2)
+    force simulation. Older networkx releases without the ``method``
+    option, or a missing SciPy, fall back to the default ``spring_layout``.
+    
+    Args:
+        G: Graph to lay out
+        k: Optimal distance between nodes
+        iterations: Maximum number of optimizer iterations
+        seed: Random seed for reproducible positions
+        
+    Returns:
+        Mapping of node to position array
+    """
+    if G.number_of_nodes() >= SPARSE_LAYOUT_THRESHOLD:
+        try:
+            return nx.spring_layout(G, k=k, iterations=iterations, seed=seed,
+                                    method='energy')
+        except (ImportError, TypeError) as e:
+            logger.debug(f"Sparse layout unavailable, using spring_layout: {e}")
+    
+    return nx.spring_layout(G, k=k, iterations=iterations, seed=seed)
+
+
+def _edge_segments(G: nx.Graph, nodes: List[Any], coords: np.ndarray) -> np.ndarray:
+    """Gather edge endpoints into a NaN-separated polyline array.
+    
+    Args:
+        G: Graph whose edges to gather
+        nodes: Node order matching the rows of ``coords``
+        coords: (N, 2) array of node positions
+        
+    Returns:
+        (3 * E, 2) array of source, target, NaN rows for each edge
+    """
+    node_index = {node: i for i, node in enumerate(nodes)}
+    edges = np.array([(node_index[u], node_index[v]) for u, v in G.edges()],
+                     dtype=np.intp).reshape(-1, 2)
+    segments = np.full((len(edges) * 3, 2), np.nan)
+    segments[0::3] = coords[edges[:, 0]]
+    segments[1::3] = coords[edges[:, 1]]
+    return segments
 
-logger = logging.getLogger(__name__)
+
+def _node_years(data: List[Dict[str, Any]], default: int = 2020) -> np.ndarray:
+    """Gather node publication years as floats, with NaN for null years.
+    
+    Semantic Scholar often returns ``"year": null``; those nodes are kept
+    as NaN so the renderers treat them as missing values.
+    """
+    return np.fromiter((np.nan if (year := d.get('year', default)) is None else year
+                        for d in data), dtype=np.float32, count=len(data))
+
+
+@functools.lru_cache(maxsize=65536)
+def _node_hover_text(title: str, year: Any, citations: Any) -> str:
+    """Format the hover label for a citation network node.
+    
+    Keyed by the attribute values themselves, so refreshing a figure for
+    the same papers reuses the formatted labels even though the graph is
+    rebuilt on every call.
+    """
+    return f"{title[:50]}...<br>Year: {year}<br>Citations: {citations}"
+
+
+def _rasterize(artists: Any) -> None:
+    """Mark a collection returned by the networkx draw helpers as rasterized.
+    
+    Directed edges drawn with arrows come back as a list of
+    ``FancyArrowPatch`` objects, which matplotlib cannot rasterize, so
+    anything other than a single collection is left untouched.
+    """
+    from matplotlib.collections import Collection
+    
+    if isinstance(artists, Collection):
+        artists.set_rasterized(True)
 
 
 class Visualizer:
     """Creates visualizations for research paper analysis."""
     
-    def __init__(self, output_dir: str = "./visualizations"):
+    def __init__(self, output_dir: str = "./visualizations", dpi: int = 150):
         """Initialize the visualizer.
         
         Args:
             output_dir: Directory to save visualization outputs
+            dpi: Resolution for saved static images
         """
         self.output_dir = Path(output_dir)
+        self.dpi = dpi
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Set style for matplotlib
-        plt.style.use('seaborn-v0_8-darkgrid' if 'seaborn-v0_8-darkgrid' in plt.style.available else 'default')
+        # Spring layouts keyed by graph structure and layout parameters
+        self._layout_cache: Dict[Tuple, Dict[Any, np.ndarray]] = {}
+        
+        # Plotting libraries are imported on first use; False marks a
+        # library that failed to import
+        self._plt: Any = None
+        self._go: Any = None
+        self._ds: Any = None
+    
+    def _pyplot(self) -> Any:
+        """Import matplotlib.pyplot on first use and apply the plot style."""
+        if self._plt is None:
+            import matplotlib.pyplot as plt
+            
+            # Set style for matplotlib
+            plt.style.use('seaborn-v0_8-darkgrid' if 'seaborn-v0_8-darkgrid' in plt.style.available else 'default')
+            self._plt = plt
+        return self._plt
+    
+    def _plotly(self) -> Optional[Any]:
+        """Import plotly.graph_objects on first use.
+        
+        Returns:
+            The module, or None if plotly is not installed
+        """
+        if self._go is None:
+            try:
+                import plotly.graph_objects as go
+                import plotly.io as pio
+                self._go = go
+            except ImportError:
+                logger.warning("Plotly not available. Interactive visualizations will be disabled.")
+                self._go = False
+            else:
+                # Serialize figure JSON with orjson when it is installed
+                try:
+                    pio.json.config.default_engine = 'orjson'
+                except (ImportError, ValueError):
+                    logger.debug("orjson not available, using the default plotly JSON engine")
+        return self._go or None
+    
+    def _datashader(self) -> Optional[Tuple[Any, Any]]:
+        """Import datashader and its transfer functions on first use.
+        
+        Returns:
+            Tuple of (datashader, transfer_functions), or None if datashader
+            is not installed
+        """
+        if self._ds is None:
+            try:
+                import datashader as ds
+                import datashader.transfer_functions as tf
+                self._ds = (ds, tf)
+            except ImportError:
+                self._ds = False
+        return self._ds or None
+    
+    def _cached_spring_layout(self, G: nx.Graph, k: float = 2, iterations: int = 50,
+                              seed: int = 42) -> Dict[Any, np.ndarray]:
+        """Compute a spring layout, reusing positions for an identical graph.
+        
+        Layouts are memoized in memory and persisted as ``.npz`` files under
+        ``output_dir/.layout_cache``, keyed by a hash of the node set, edge
+        set and layout parameters, so unchanged graphs skip the layout on
+        later runs too.
+        
+        Args:
+            G: Graph to lay out
+            k: Optimal distance between nodes
+            iterations: Number of force-directed iterations
+            seed: Random seed for reproducible positions
+            
+        Returns:
+            Mapping of node to position array; the arrays are copies that
+            the caller may modify
+        """
+        key = (frozenset(G.nodes), frozenset(G.edges), k, iterations, seed)
+        pos = self._layout_cache.get(key)
+        if pos is not None:
+            logger.debug(f"Reusing cached layout for {G.number_of_nodes()} nodes")
+            return {node: xy.copy() for node, xy in pos.items()}
+        
+        # Canonical node order so the stored rows map back deterministically
+        order = sorted(G.nodes, key=repr)
+        digest = hashlib.blake2b(
+            repr((order, sorted(map(repr, G.edges)), k, iterations, seed)).encode('utf-8'),
+            digest_size=8
+        ).hexdigest()
+        cache_path = self.output_dir / '.layout_cache' / f"{digest}.npz"
+        
+        if cache_path.exists():
+            try:
+                with np.load(cache_path, allow_pickle=False) as cached:
+                    coords = cached['pos']
+                if coords.shape == (len(order), 2):
+                    pos = dict(zip(order, coords))
+                    logger.debug(f"Loaded layout from {cache_path}")
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Error reading layout cache {cache_path}: {e}")
+        
+        if pos is None:
+            pos = _fast_spring_layout(G, k=k, iterations=iterations, seed=seed)
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+                with open(tmp_path, 'wb') as f:
+                    np.savez(f, pos=np.array([pos[node] for node in order]).reshape(len(order), 2))
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                logger.warning(f"Error writing layout cache {cache_path}: {e}")
+        
+        self._layout_cache[key] = pos
+        return {node: xy.copy() for node, xy in pos.items()}
+    
+    def compute_layout(self, G: nx.Graph) -> Dict[Any, np.ndarray]:
+        """Compute the citation network layout for a graph.
+        
+        Layouts are cached in memory and on disk by graph structure, so
+        rendering the same graph to several formats solves the layout once.
+        
+        Args:
+            G: Graph to lay out
+            
+        Returns:
+            Mapping of node to position array
+        """
+        return self._cached_spring_layout(G, k=2, iterations=50, seed=42)
     
     def create_citation_network(self, papers: Dict[str, Any], 
                                citations: List[Dict[str, str]],
                                output_file: str = "citation_network.png",
-                               interactive: bool = True) -> None:
+                               interactive: bool = True,
+                               backend: Optional[str] = None,
+                               static: bool = True,
+                               pos: Optional[Dict[str, Any]] = None) -> None:
         """Create a citation network visualization.
         
         Args:
@@ -57,48 +266,80 @@ class Visualizer:
             citations: List of citation edges {from: paper_id, to: paper_id}
             output_file: Output filename
             interactive: Whether to create interactive plotly version
+            backend: Static renderer, "matplotlib" or "datashader". Defaults to
+                datashader for graphs above DATASHADER_NODE_THRESHOLD nodes.
+            static: Whether to render the static image; pass False alongside
+                interactive=True to produce only the HTML version
+            pos: Precomputed node positions {paper_id: (x, y)}; computed with
+                compute_layout when omitted
         """
+        if backend not in (None, 'matplotlib', 'datashader'):
+            raise ValueError(f"Unknown backend: {backend}")
+        
         # Create directed graph
         G = nx.DiGraph()
         
-        # Add nodes
-        for paper_id, paper in papers.items():
-            G.add_node(paper_id, 
-                      title=paper.get('title', 'Unknown'),
-                      year=paper.get('year', 0),
-                      citations=paper.get('citationCount', 0))
+        # Add nodes with their attributes in one bulk load
+        G.add_nodes_from(
+            (paper_id, {'title': paper.get('title', 'Unknown'),
+                        'year': paper.get('year', 0),
+                        'citations': paper.get('citationCount', 0)})
+            for paper_id, paper in papers.items()
+        )
         
-        # Add edges
-        for citation in citations:
-            if citation['from'] in G.nodes and citation['to'] in G.nodes:
-                G.add_edge(citation['from'], citation['to'])
+        # Add edges between known papers in one bulk insert
+        node_set = frozenset(papers)
+        G.add_edges_from((c['from'], c['to']) for c in citations
+                         if c['from'] in node_set and c['to'] in node_set)
         
         logger.info(f"Citation network: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
         
-        if interactive and PLOTLY_AVAILABLE:
-            self._create_interactive_network(G, output_file.replace('.png', '.html'))
+        # Use spring layout for positioning, shared by both renders
+        if pos is None:
+            pos = self.compute_layout(G)
+        
+        if interactive and self._plotly() is not None:
+            self._create_interactive_network(G, pos, output_file.replace('.png', '.html'))
+        
+        if not static:
+            return
+        
+        # Rasterize very large graphs instead of creating one artist per edge
+        if backend is None:
+            backend = 'datashader' if len(G) > DATASHADER_NODE_THRESHOLD else 'matplotlib'
+        if backend == 'datashader' and self._datashader() is None:
+            logger.warning("Datashader not available. Falling back to matplotlib.")
+            backend = 'matplotlib'
+        if backend == 'datashader' and len(G):
+            self._render_network_datashader(G, pos, output_file)
+            return
         
         # Create static visualization
+        plt = self._pyplot()
         fig, ax = plt.subplots(figsize=(16, 12))
         
-        # Use spring layout for positioning
-        pos = nx.spring_layout(G, k=2, iterations=50, seed=42)
+        # Pull node attributes into arrays in one pass over the node data
+        data = [attrs for _, attrs in G.nodes(data=True)]
+        n_nodes = len(data)
+        cites = np.fromiter((d.get('citations', 1) for d in data), dtype=np.float32, count=n_nodes)
         
         # Node sizes based on citation count
-        node_sizes = [G.nodes[node].get('citations', 1) * 10 + 100 for node in G.nodes()]
+        node_sizes = cites * 10 + 100
         
         # Node colors based on year
-        years = [G.nodes[node].get('year', 2020) for node in G.nodes()]
+        years = _node_years(data)
         
-        # Draw network
-        nx.draw_networkx_edges(G, pos, alpha=0.3, edge_color='gray', 
-                              arrows=True, arrowsize=10, ax=ax)
+        # Draw network; rasterize the dense layers so vector output stays light
+        edges = nx.draw_networkx_edges(G, pos, alpha=0.3, edge_color='gray', 
+                                       arrows=True, arrowsize=10, ax=ax)
         nodes = nx.draw_networkx_nodes(G, pos, node_size=node_sizes, 
                                       node_color=years, cmap='viridis',
                                       alpha=0.8, ax=ax)
+        _rasterize(edges)
+        _rasterize(nodes)
         
         # Add colorbar for years
-        if years:
+        if n_nodes:
             plt.colorbar(nodes, ax=ax, label='Publication Year')
         
         ax.set_title('Citation Network', fontsize=16, fontweight='bold')
@@ -106,57 +347,104 @@ class Visualizer:
         
         plt.tight_layout()
         output_path = self.output_dir / output_file
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight')
         plt.close()
         
         logger.info(f"Saved citation network to {output_path}")
     
-    def _create_interactive_network(self, G: nx.DiGraph, output_file: str) -> None:
-        """Create interactive network visualization using plotly."""
-        pos = nx.spring_layout(G, k=2, iterations=50, seed=42)
-        
-        # Create edge traces
-        edge_x = []
-        edge_y = []
-        for edge in G.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.extend([x0, x1, None])
-            edge_y.extend([y0, y1, None])
-        
-        edge_trace = go.Scatter(
-            x=edge_x, y=edge_y,
+    def _render_network_datashader(self, G: nx.DiGraph, pos: Dict[Any, np.ndarray],
+                                   output_file: str, width: int = 1600,
+                                   height: int = 1200) -> None:
+        """Rasterize a citation network with datashader.
+        
+        Edges are aggregated as line density and nodes are colored by mean
+        publication year per pixel, so cost scales with the canvas rather
+        than with the number of matplotlib artists.
+        
+        Args:
+            G: Citation graph
+            pos: Node positions
+            output_file: Output filename
+            width: Image width in pixels
+            height: Image height in pixels
+        """
+        import matplotlib
+        import pandas as pd
+        
+        ds, tf = self._datashader()
+        
+        nodes = list(G.nodes())
+        coords = np.array([pos[node] for node in nodes]).reshape(len(nodes), 2)
+        years = _node_years([G.nodes[node] for node in nodes])
+        
+        nodes_df = pd.DataFrame({'x': coords[:, 0], 'y': coords[:, 1], 'year': years})
+        segments = _edge_segments(G, nodes, coords)
+        edges_df = pd.DataFrame({'x': segments[:, 0], 'y': segments[:, 1]})
+        
+        # Share one padded extent so edges and nodes line up
+        lo, hi = coords.min(axis=0), coords.max(axis=0)
+        pad = np.maximum(hi - lo, 1e-9) * 0.05
+        canvas = ds.Canvas(plot_width=width, plot_height=height,
+                           x_range=(lo[0] - pad[0], hi[0] + pad[0]),
+                           y_range=(lo[1] - pad[1], hi[1] + pad[1]))
+        
+        layers = []
+        if len(segments):
+            edge_agg = canvas.line(edges_df, 'x', 'y', agg=ds.count())
+            layers.append(tf.shade(edge_agg, cmap=['lightgray', 'dimgray'], how='eq_hist'))
+        node_agg = canvas.points(nodes_df, 'x', 'y', agg=ds.mean('year'))
+        layers.append(tf.spread(tf.shade(node_agg, cmap=matplotlib.colormaps['viridis']), px=2))
+        
+        img = tf.set_background(tf.stack(*layers), 'white')
+        
+        output_path = self.output_dir / output_file
+        img.to_pil().save(output_path)
+        logger.info(f"Saved citation network to {output_path}")
+    
+    def _create_interactive_network(self, G: nx.DiGraph, pos: Optional[Dict[Any, np.ndarray]],
+                                    output_file: str) -> None:
+        """Create interactive network visualization using plotly.
+        
+        Edges and nodes are drawn with WebGL (``Scattergl``) traces, which
+        stay responsive in the browser for graphs with thousands of edges.
+        """
+        go = self._plotly()
+        if pos is None:
+            pos = self.compute_layout(G)
+        
+        # Stack node positions once; edges and nodes both index into it
+        nodes = list(G.nodes())
+        data = [G.nodes[node] for node in nodes]
+        n_nodes = len(nodes)
+        # Single precision halves the size of the arrays embedded in the HTML
+        coords = np.array([pos[node] for node in nodes], dtype=np.float32).reshape(n_nodes, 2)
+        
+        # Create edge traces by gathering endpoints, NaN-separated per segment
+        segments = _edge_segments(G, nodes, coords).astype(np.float32)
+        
+        edge_trace = go.Scattergl(
+            x=segments[:, 0], y=segments[:, 1],
             line=dict(width=0.5, color='#888'),
             hoverinfo='none',
             mode='lines'
         )
         
-        # Create node traces
-        node_x = []
-        node_y = []
-        node_text = []
-        node_size = []
+        # Create node traces from attribute arrays gathered in one pass
+        years = _node_years(data)
+        cites = np.fromiter((d.get('citations', 0) for d in data), dtype=np.float32, count=n_nodes)
+        node_size = np.sqrt(cites) * 5 + 10
         
-        for node in G.nodes():
-            x, y = pos[node]
-            node_x.append(x)
-            node_y.append(y)
-            
-            title = G.nodes[node].get('title', 'Unknown')
-            year = G.nodes[node].get('year', 'N/A')
-            citations = G.nodes[node].get('citations', 0)
-            
-            node_text.append(f"{title[:50]}...<br>Year: {year}<br>Citations: {citations}")
-            node_size.append(np.sqrt(citations) * 5 + 10)
+        node_text = [_node_hover_text(d.get('title', 'Unknown'), d.get('year', 'N/A'),
+                                      d.get('citations', 0)) for d in data]
         
-        node_trace = go.Scatter(
-            x=node_x, y=node_y,
+        node_trace = go.Scattergl(
+            x=coords[:, 0], y=coords[:, 1],
             mode='markers',
             hoverinfo='text',
             text=node_text,
             marker=dict(
                 size=node_size,
-                color=[G.nodes[node].get('year', 2020) for node in G.nodes()],
+                color=years,
                 colorscale='Viridis',
                 showscale=True,
                 colorbar=dict(title='Year')
@@ -175,7 +463,8 @@ class Visualizer:
                        ))
         
         output_path = self.output_dir / output_file
-        fig.write_html(str(output_path))
+        # Load plotly.js from the CDN instead of embedding ~4MB per file
+        fig.write_html(str(output_path), include_plotlyjs='cdn', full_html=True, validate=False)
         logger.info(f"Saved interactive network to {output_path}")
     
     def create_timeline_chart(self, papers: List[Dict[str, Any]], 
@@ -187,25 +476,20 @@ class Visualizer:
             output_file: Output filename
         """
         # Extract years
-        years = []
-        for paper in papers:
-            year = paper.get('year')
-            if year:
-                years.append(int(year))
+        years = np.fromiter((int(p['year']) for p in papers if p.get('year')), dtype=np.int32)
         
-        if not years:
+        if not years.size:
             logger.warning("No year information available for timeline")
             return
         
-        # Count papers by year
-        year_counts = Counter(years)
-        sorted_years = sorted(year_counts.keys())
-        counts = [year_counts[year] for year in sorted_years]
+        # Count papers by year (np.unique returns the years sorted)
+        sorted_years, counts = np.unique(years, return_counts=True)
         
         # Create visualization
+        plt = self._pyplot()
         fig, ax = plt.subplots(figsize=(14, 6))
         
-        ax.bar(sorted_years, counts, color='steelblue', alpha=0.7, edgecolor='black')
+        bars = ax.bar(sorted_years, counts, color='steelblue', alpha=0.7, edgecolor='black')
         ax.plot(sorted_years, counts, color='darkred', marker='o', linewidth=2, markersize=6)
         
         ax.set_xlabel('Year', fontsize=12, fontweight='bold')
@@ -214,12 +498,11 @@ class Visualizer:
         ax.grid(True, alpha=0.3, linestyle='--')
         
         # Add value labels on bars
-        for year, count in zip(sorted_years, counts):
-            ax.text(year, count + 0.5, str(count), ha='center', va='bottom', fontsize=9)
+        ax.bar_label(bars, padding=3, fontsize=9)
         
         plt.tight_layout()
         output_path = self.output_dir / output_file
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight')
         plt.close()
         
         logger.info(f"Saved timeline chart to {output_path}")
@@ -232,16 +515,23 @@ class Visualizer:
             analyses: List of paper analysis results
             output_file: Output filename
         """
-        scores = [a.get('relevance_score', 0) for a in analyses if 'relevance_score' in a]
+        scores = np.fromiter((a['relevance_score'] for a in analyses if 'relevance_score' in a),
+                             dtype=np.float32)
         
-        if not scores:
+        if not scores.size:
             logger.warning("No relevance scores available")
             return
         
+        # Compute summary statistics once from the same array
+        mean, median, std = scores.mean(), np.median(scores), scores.std()
+        
+        plt = self._pyplot()
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
         
         # Histogram
-        ax1.hist(scores, bins=10, color='teal', alpha=0.7, edgecolor='black')
+        hist, edges = np.histogram(scores, bins=10)
+        ax1.bar(edges[:-1], hist, width=np.diff(edges), align='edge',
+                color='teal', alpha=0.7, edgecolor='black')
         ax1.set_xlabel('Relevance Score', fontsize=12, fontweight='bold')
         ax1.set_ylabel('Frequency', fontsize=12, fontweight='bold')
         ax1.set_title('Distribution of Relevance Scores', fontsize=13, fontweight='bold')
@@ -254,42 +544,62 @@ class Visualizer:
         ax2.grid(True, alpha=0.3, linestyle='--')
         
         # Add statistics
-        stats_text = f"Mean: {np.mean(scores):.2f}\nMedian: {np.median(scores):.2f}\nStd: {np.std(scores):.2f}"
-        ax2.text(1.15, np.mean(scores), stats_text, fontsize=10, 
+        stats_text = f"Mean: {mean:.2f}\nMedian: {median:.2f}\nStd: {std:.2f}"
+        ax2.text(1.15, mean, stats_text, fontsize=10, 
                 bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
         
         plt.tight_layout()
         output_path = self.output_dir / output_file
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight')
         plt.close()
         
         logger.info(f"Saved relevance distribution to {output_path}")
     
     def create_architecture_diagram(self, components: List[Dict[str, str]],
                                    connections: List[Dict[str, str]],
-                                   output_file: str = "architecture.png") -> None:
+                                   output_file: str = "architecture.png",
+                                   pos: Optional[Dict[str, Any]] = None) -> None:
         """Create an architecture diagram.
         
         Args:
             components: List of components with 'name' and 'type'
             connections: List of connections with 'from' and 'to'
             output_file: Output filename
+            pos: Precomputed node positions {name: (x, y)}; a hierarchical
+                layout is computed when omitted
         """
         G = nx.DiGraph()
         
-        # Add nodes with types
-        for comp in components:
-            G.add_node(comp['name'], comp_type=comp.get('type', 'component'))
+        # Add nodes with types in one bulk load
+        G.add_nodes_from((comp['name'], {'comp_type': comp.get('type', 'component')})
+                         for comp in components)
         
-        # Add edges
-        for conn in connections:
-            if conn['from'] in G.nodes and conn['to'] in G.nodes:
-                G.add_edge(conn['from'], conn['to'])
+        # Add edges between known components in one bulk insert
+        node_set = frozenset(comp['name'] for comp in components)
+        G.add_edges_from((c['from'], c['to']) for c in connections
+                         if c['from'] in node_set and c['to'] in node_set)
+        
+        plt = self._pyplot()
+        import matplotlib.patches as mpatches
         
         fig, ax = plt.subplots(figsize=(14, 10))
         
-        # Layout
-        pos = nx.spring_layout(G, k=3, iterations=50, seed=42)
+        # Hierarchical layout: components flow along their connections
+        if pos is None:
+            try:
+                pos = nx.nx_agraph.graphviz_layout(G, prog='dot')
+            except (ImportError, OSError) as e:
+                logger.debug(f"Graphviz layout unavailable, using multipartite layout: {e}")
+                
+                # Without graphviz, layer acyclic diagrams by dependency depth and
+                # fall back to one column per component type otherwise
+                if nx.is_directed_acyclic_graph(G):
+                    layers = {node: depth for depth, generation in enumerate(nx.topological_generations(G))
+                              for node in generation}
+                    nx.set_node_attributes(G, layers, 'layer')
+                    pos = nx.multipartite_layout(G, subset_key='layer')
+                else:
+                    pos = nx.multipartite_layout(G, subset_key='comp_type')
         
         # Color map for component types
         type_colors = {
@@ -300,14 +610,20 @@ class Visualizer:
             'component': 'lightgray'
         }
         
-        node_colors = [type_colors.get(G.nodes[node].get('comp_type', 'component'), 'lightgray') 
-                      for node in G.nodes()]
+        # Group nodes by type so each type is drawn as a single collection;
+        # unknown types share the generic component color
+        groups = defaultdict(list)
+        for node, comp_type in G.nodes(data='comp_type', default='component'):
+            groups[comp_type if comp_type in type_colors else 'component'].append(node)
         
         # Draw
-        nx.draw_networkx_edges(G, pos, alpha=0.5, edge_color='gray', 
-                              arrows=True, arrowsize=20, ax=ax, width=2)
-        nx.draw_networkx_nodes(G, pos, node_color=node_colors, 
-                              node_size=3000, alpha=0.9, ax=ax)
+        edges = nx.draw_networkx_edges(G, pos, alpha=0.5, edge_color='gray', 
+                                       arrows=True, arrowsize=20, ax=ax, width=2)
+        _rasterize(edges)
+        for comp_type, group in groups.items():
+            xy = np.array([pos[node] for node in group])
+            ax.scatter(xy[:, 0], xy[:, 1], s=3000, c=type_colors[comp_type],
+                       alpha=0.9, zorder=2, rasterized=True)
         nx.draw_networkx_labels(G, pos, font_size=10, font_weight='bold', ax=ax)
         
         # Legend
@@ -320,7 +636,7 @@ class Visualizer:
         
         plt.tight_layout()
         output_path = self.output_dir / output_file
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight')
         plt.close()
         
         logger.info(f"Saved architecture diagram to {output_path}")
@@ -335,9 +651,12 @@ class Visualizer:
             analyses: List of analysis results
             output_file: Output filename
         """
-        if not PLOTLY_AVAILABLE:
+        go = self._plotly()
+        if go is None:
             logger.warning("Plotly not available. Cannot create dashboard.")
             return
+        from plotly.subplots import make_subplots
+        import pandas as pd
         
         # Create subplots
         fig = make_subplots(
@@ -348,42 +667,48 @@ class Visualizer:
                    [{'type': 'bar'}, {'type': 'scatter'}]]
         )
         
-        # Papers by year
-        years = [p.get('year') for p in papers if p.get('year')]
-        if years:
-            year_counts = Counter(years)
+        # Load the paper fields once; each panel aggregates a column
+        df = pd.DataFrame(papers, columns=['year', 'venue', 'citationCount'])
+        year = pd.to_numeric(df['year'], errors='coerce')
+        cite_count = pd.to_numeric(df['citationCount'], errors='coerce')
+        
+        # Papers by year; compact dtypes keep the embedded JSON small
+        year_counts = year[year > 0].astype(np.int16).value_counts().sort_index()
+        if len(year_counts):
             fig.add_trace(
-                go.Bar(x=list(year_counts.keys()), y=list(year_counts.values()),
+                go.Bar(x=year_counts.index.to_numpy(), y=year_counts.to_numpy(np.int32),
                       name='Papers', marker_color='steelblue'),
                 row=1, col=1
             )
         
         # Relevance scores
-        scores = [a.get('relevance_score', 0) for a in analyses if 'relevance_score' in a]
-        if scores:
+        scores = np.fromiter((a['relevance_score'] for a in analyses if 'relevance_score' in a),
+                             dtype=np.float32)
+        if scores.size:
             fig.add_trace(
                 go.Box(y=scores, name='Relevance', marker_color='teal'),
                 row=1, col=2
             )
         
         # Top venues
-        venues = [p.get('venue', 'Unknown') for p in papers if p.get('venue')]
-        if venues:
-            venue_counts = Counter(venues).most_common(10)
+        venue = df['venue']
+        venue_counts = venue[venue.notna() & (venue != '')].value_counts().head(10)
+        if len(venue_counts):
             fig.add_trace(
-                go.Bar(y=[v[0] for v in venue_counts], x=[v[1] for v in venue_counts],
+                go.Bar(y=venue_counts.index.to_numpy(), x=venue_counts.to_numpy(np.int32),
                       orientation='h', name='Venues', marker_color='lightgreen'),
                 row=2, col=1
             )
         
-        # Citation counts
-        citations = [(p.get('year', 2020), p.get('citationCount', 0)) 
-                    for p in papers if p.get('citationCount')]
-        if citations:
+        # Citation counts, drawn with WebGL since there is one point per paper;
+        # papers without a year have no place on the x axis
+        cited = (cite_count > 0) & year.notna()
+        if cited.any():
             fig.add_trace(
-                go.Scatter(x=[c[0] for c in citations], y=[c[1] for c in citations],
-                          mode='markers', name='Citations', 
-                          marker=dict(size=8, color='darkred')),
+                go.Scattergl(x=year[cited].to_numpy(np.int16),
+                            y=cite_count[cited].to_numpy(np.int32),
+                            mode='markers', name='Citations', 
+                            marker=dict(size=8, color='darkred')),
                 row=2, col=2
             )
         
@@ -392,5 +717,6 @@ class Visualizer:
                          title_font_size=20)
         
         output_path = self.output_dir / output_file
-        fig.write_html(str(output_path))
+        # Load plotly.js from the CDN instead of embedding ~4MB per file
+        fig.write_html(str(output_path), include_plotlyjs='cdn', full_html=True, validate=False)
         logger.info(f"Saved dashboard to {output_path}")